@@ -12,6 +12,9 @@ if (!fs.existsSync(dbDir)) {
 
 export const db = new Database(dbPath, { verbose: console.log });
 
+// WAL lets readers and a writer work concurrently, including across cluster workers
+db.pragma('journal_mode = WAL');
+
 export const initDB = () => {
   const schemaPath = path.join(__dirname, 'schema.sql');
   const schema = fs.readFileSync(schemaPath, 'utf8');
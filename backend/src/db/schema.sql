@@ -60,6 +60,13 @@ CREATE TABLE IF NOT EXISTS work_logs (
     CHECK (ticket_id IS NOT NULL OR task_id IS NOT NULL)
 );
 
+-- Cached AI responses, shared by all server processes
+CREATE TABLE IF NOT EXISTS ai_response_cache (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    expires_at INTEGER NOT NULL
+);
+
 -- Generated standup notes
 CREATE TABLE IF NOT EXISTS standups (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -1,5 +1,7 @@
 import 'dotenv/config'; // MUST be first - load env before any imports
 
+import cluster from 'cluster';
+import os from 'os';
 import express, { Request, Response } from 'express';
 import cors from 'cors';
 import { initDB } from './db';
@@ -9,11 +11,33 @@ import standupRoutes from './routes/standup';
 import plansRoutes from './routes/plans';
 import tasksRoutes from './routes/tasks';
 import planningRoutes from './routes/planning';
+import { opencodeService, OPENCODE_MAX_CONCURRENCY } from './services/opencodeService';
 
 
 const app = express();
 const port = process.env.PORT || 3001;
 
+// Number of server processes; defaults to one per CPU in production. Every worker
+// holds at least one opencode prompt slot, so there are never more workers than
+// OPENCODE_MAX_CONCURRENCY, which keeps that limit server-wide
+const workerCount = Math.min(
+  parseInt(
+    process.env.WEB_CONCURRENCY || (process.env.NODE_ENV === 'production' ? String(os.cpus().length) : '1'),
+    10
+  ),
+  OPENCODE_MAX_CONCURRENCY
+);
+
+// How long shutdown waits for open requests before closing their connections
+const SHUTDOWN_GRACE_MS = 5000;
+
+// Pause before replacing a crashed worker so a repeating crash cannot spin the primary
+const WORKER_RESTART_DELAY_MS = 1000;
+
+// API responses are never revalidated by the frontend, so skip hashing every
+// JSON body to compute an ETag
+app.set('etag', false);
+
 app.use(cors());
 app.use(express.json());
 
@@ -33,14 +57,99 @@ app.use('/api/planning', planningRoutes);
 // Initialize database and start server
 const startServer = async () => {
   try {
-    initDB();
-    app.listen(port, () => {
+    // In cluster mode the primary has already applied the schema
+    if (!cluster.isWorker) {
+      initDB();
+    }
+    const server = app.listen(port, () => {
       console.log(`Server is running on port ${port}`);
     });
+
+    // Let in-flight requests finish for a moment, then drop whatever is left
+    // (SSE streams, prompts waiting on opencode); a second signal exits at once
+    let shuttingDown = false;
+    const shutdown = () => {
+      if (shuttingDown) {
+        process.exit(1);
+      }
+      shuttingDown = true;
+      server.close(() => {
+        opencodeService.close();
+        process.exit(0);
+      });
+      server.closeIdleConnections();
+      setTimeout(() => server.closeAllConnections(), SHUTDOWN_GRACE_MS).unref();
+    };
+    process.on('SIGINT', shutdown);
+    process.on('SIGTERM', shutdown);
   } catch (error) {
     console.error('Failed to start server:', error);
     process.exit(1);
   }
 };
 
-startServer();
+// Fork worker processes that share the listening port
+const startCluster = () => {
+  try {
+    initDB();
+  } catch (error) {
+    console.error('Failed to initialize database:', error);
+    process.exit(1);
+  }
+
+  // Workers are told how many of them there are so process-wide limits can be
+  // split between them
+  const forkWorker = () => cluster.fork({ CLUSTER_WORKER_COUNT: String(workerCount) });
+
+  for (let i = 0; i < workerCount; i++) {
+    forkWorker();
+  }
+
+  // Only workers that got as far as listening are restarted; one that dies during
+  // startup (port in use, bad schema) would just crash again in a tight loop
+  const listening = new Set<number>();
+  cluster.on('listening', worker => {
+    listening.add(worker.id);
+  });
+
+  let shuttingDown = false;
+  let pendingRestarts = 0;
+  cluster.on('exit', (worker, code) => {
+    const started = listening.delete(worker.id);
+    if (shuttingDown) {
+      return;
+    }
+    if (started) {
+      console.error(`Worker ${worker.process.pid} exited with code ${code}, restarting`);
+      pendingRestarts++;
+      setTimeout(() => {
+        pendingRestarts--;
+        if (!shuttingDown) {
+          forkWorker();
+        }
+      }, WORKER_RESTART_DELAY_MS);
+      return;
+    }
+    console.error(`Worker ${worker.process.pid} exited with code ${code} before listening, not restarting`);
+    const remaining = Object.values(cluster.workers || {}).filter(w => w && w.id !== worker.id);
+    if (remaining.length === 0 && pendingRestarts === 0) {
+      console.error('No workers left, exiting');
+      process.exit(1);
+    }
+  });
+
+  const shutdown = () => {
+    shuttingDown = true;
+    for (const worker of Object.values(cluster.workers || {})) {
+      worker?.kill('SIGTERM');
+    }
+  };
+  process.on('SIGINT', shutdown);
+  process.on('SIGTERM', shutdown);
+};
+
+if (cluster.isPrimary && workerCount > 1) {
+  startCluster();
+} else {
+  startServer();
+}
@@ -1,71 +1,171 @@
 import { Router, Request, Response } from 'express';
-import { opencodeService } from '../services/opencodeService';
+import { opencodeService, isModelName, MODEL_NAMES } from '../services/opencodeService';
+import { ServiceUnavailableError } from '../services/retryPolicy';
 
 const router = Router();
 
+// Cached responses are used unless the caller passes ?no_cache=1
+const useCache = (req: Request): boolean => req.query.no_cache !== '1';
+
+// Reject unknown models up front instead of after a round trip to opencode
+const invalidModel = (model: unknown): boolean => model != null && !isModelName(model);
+const INVALID_MODEL_ERROR = `model must be one of: ${MODEL_NAMES.join(', ')}`;
+
 /**
  * POST /api/ai/chat
- * Body: { message: string, model?: string }
+ * Body: { message: string, model?: string, stream?: boolean }
+ * Query: no_cache=1 skips the response cache
+ * With stream set, responds with server-sent events: { delta } per text chunk,
+ * then { done: true, response } or { error }
  */
 router.post('/chat', async (req: Request, res: Response) => {
-  const { message, model } = req.body;
+  const { message, model, stream } = req.body;
 
   if (!message) {
     return res.status(400).json({ error: 'Message is required' });
   }
 
+  if (invalidModel(model)) {
+    return res.status(400).json({ error: INVALID_MODEL_ERROR });
+  }
+
+  const useSmartModel = model === 'glm-5';
+
+  if (stream) {
+    res.writeHead(200, {
+      'Content-Type': 'text/event-stream',
+      'Cache-Control': 'no-cache',
+      Connection: 'keep-alive',
+    });
+
+    // A client that goes away before the reply is done aborts the prompt
+    const disconnect = new AbortController();
+    res.on('close', () => {
+      if (!res.writableFinished) {
+        disconnect.abort();
+      }
+    });
+    const send = (data: Record<string, unknown>) => {
+      if (!disconnect.signal.aborted) {
+        res.write(`data: ${JSON.stringify(data)}\n\n`);
+      }
+    };
+
+    try {
+      const result = await opencodeService.chatStream(message, 'planner', useSmartModel, delta => {
+        send({ delta });
+      }, disconnect.signal);
+      send({ done: true, response: result.response });
+    } catch (error: unknown) {
+      if (!disconnect.signal.aborted) {
+        console.error('AI Chat Stream Error:', error);
+        send({ error: error instanceof Error ? error.message : 'Internal Server Error' });
+      }
+    }
+    return res.end();
+  }
+
   try {
-    const useSmartModel = model === 'glm-5';
-    const result = await opencodeService.chat(message, 'planner', useSmartModel);
+    const result = await opencodeService.chat(message, 'planner', useSmartModel, { useCache: useCache(req) });
     res.json({ response: result.response });
   } catch (error: unknown) {
     console.error('AI Chat Error:', error);
     const errorMessage = error instanceof Error ? error.message : 'Internal Server Error';
-    res.status(500).json({ error: errorMessage });
+    res.status(error instanceof ServiceUnavailableError ? 503 : 500).json({ error: errorMessage });
   }
 });
 
 /**
  * POST /api/ai/parse-ticket
  * Body: { ticket_key: string, ticket_data: object, model?: string }
- * Parses a Jira ticket using GLM-5 via Python agent service
+ * Parses a Jira ticket using GLM-4.7 for short prompts and GLM-5 for long ones,
+ * or always the given model when one is passed
+ * Query: no_cache=1 skips the response cache
  */
 router.post('/parse-ticket', async (req: Request, res: Response) => {
-  const { ticket_key, ticket_data } = req.body;
+  const { ticket_key, ticket_data, model } = req.body;
 
   if (!ticket_key || !ticket_data) {
     return res.status(400).json({ error: 'ticket_key and ticket_data are required' });
   }
 
+  if (invalidModel(model)) {
+    return res.status(400).json({ error: INVALID_MODEL_ERROR });
+  }
+
   try {
-    const parsedTicket = await opencodeService.parseTicket(ticket_key, ticket_data);
+    const parsedTicket = await opencodeService.parseTicket(ticket_key, ticket_data, {
+      useCache: useCache(req),
+      model: model ?? undefined,
+    });
     res.json(parsedTicket);
   } catch (error: unknown) {
     console.error('Parse Ticket Error:', error);
     const errorMessage = error instanceof Error ? error.message : 'Failed to parse ticket';
-    res.status(500).json({ error: errorMessage });
+    res.status(error instanceof ServiceUnavailableError ? 503 : 500).json({ error: errorMessage });
+  }
+});
+
+/**
+ * POST /api/ai/parse-tickets-batch
+ * Body: [{ ticket_key: string, ticket_data: object }, ...]
+ * Parses several Jira tickets concurrently and returns them in request order
+ * Query: no_cache=1 skips the response cache
+ */
+router.post('/parse-tickets-batch', async (req: Request, res: Response) => {
+  const tickets = req.body;
+
+  if (!Array.isArray(tickets) || tickets.length === 0) {
+    return res.status(400).json({ error: 'A non-empty array of tickets is required' });
+  }
+
+  if (tickets.some(t => !t || !t.ticket_key || !t.ticket_data)) {
+    return res.status(400).json({ error: 'Each ticket requires ticket_key and ticket_data' });
+  }
+
+  try {
+    const parsedTickets = await opencodeService.parseTickets(
+      tickets.map((t: { ticket_key: string; ticket_data: Record<string, unknown> }) => ({
+        ticketKey: t.ticket_key,
+        ticketData: t.ticket_data,
+      })),
+      { useCache: useCache(req) }
+    );
+    res.json(parsedTickets);
+  } catch (error: unknown) {
+    console.error('Parse Tickets Batch Error:', error);
+    const errorMessage = error instanceof Error ? error.message : 'Failed to parse tickets';
+    res.status(error instanceof ServiceUnavailableError ? 503 : 500).json({ error: errorMessage });
   }
 });
 
 /**
  * POST /api/ai/analyze-task
  * Body: { description: string, model?: string }
- * Analyzes a manual task description using GLM
+ * Analyzes a manual task description using GLM-4.7, or GLM-5 when model is 'glm-5'
+ * Query: no_cache=1 skips the response cache
  */
 router.post('/analyze-task', async (req: Request, res: Response) => {
-  const { description } = req.body;
+  const { description, model } = req.body;
 
   if (!description) {
     return res.status(400).json({ error: 'description is required' });
   }
 
+  if (invalidModel(model)) {
+    return res.status(400).json({ error: INVALID_MODEL_ERROR });
+  }
+
   try {
-    const analysis = await opencodeService.analyzeTask(description);
+    const analysis = await opencodeService.analyzeTask(description, {
+      useCache: useCache(req),
+      useSmartModel: model === 'glm-5',
+    });
     res.json(analysis);
   } catch (error: unknown) {
     console.error('Analyze Task Error:', error);
     const errorMessage = error instanceof Error ? error.message : 'Failed to analyze task';
-    res.status(500).json({ error: errorMessage });
+    res.status(error instanceof ServiceUnavailableError ? 503 : 500).json({ error: errorMessage });
   }
 });
 
@@ -1,5 +1,6 @@
 import { Router, Request, Response } from 'express';
 import { opencodeService } from '../services/opencodeService';
+import { ServiceUnavailableError } from '../services/retryPolicy';
 
 const router = Router();
 
@@ -26,7 +27,7 @@ Please provide:
     res.json({ recommendation: result.response });
   } catch (error) {
     console.error('Failed to get recommendation:', error);
-    res.status(500).json({ error: 'Failed to get recommendation' });
+    res.status(error instanceof ServiceUnavailableError ? 503 : 500).json({ error: 'Failed to get recommendation' });
   }
 });
 
@@ -52,7 +53,7 @@ Please provide:
     res.json({ guidance: result.response });
   } catch (error) {
     console.error('Failed to get task guidance:', error);
-    res.status(500).json({ error: 'Failed to get task guidance' });
+    res.status(error instanceof ServiceUnavailableError ? 503 : 500).json({ error: 'Failed to get task guidance' });
   }
 });
 
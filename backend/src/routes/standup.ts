@@ -1,6 +1,7 @@
 import { Router, Request, Response } from 'express';
-import { standupService } from '../services/standupService';
-import { opencodeService } from '../services/opencodeService';
+import { standupService, appendLines } from '../services/standupService';
+import { opencodeService, needsSmartModel } from '../services/opencodeService';
+import { ServiceUnavailableError } from '../services/retryPolicy';
 import { db } from '../db';
 
 const router = Router();
@@ -18,7 +19,7 @@ router.post('/generate', async (req: Request, res: Response) => {
   } catch (error: unknown) {
     console.error('Error generating standup:', error);
     const errorMessage = error instanceof Error ? error.message : 'Failed to generate standup';
-    res.status(500).json({ error: errorMessage });
+    res.status(error instanceof ServiceUnavailableError ? 503 : 500).json({ error: errorMessage });
   }
 });
 
@@ -40,11 +41,9 @@ ${todayForecast || 'No specific plan reported'}
 ${blockers || 'No blockers reported'}
 
 **Today's scheduled tasks:**
-${todayTasks && todayTasks.length > 0 
-  ? todayTasks.map((t: { title: string; status: string; priority: string }, i: number) => 
-      `${i + 1}. ${t.title} (${t.status}, ${t.priority})`
-    ).join('\n')
-  : 'No tasks scheduled'}
+${appendLines('', todayTasks || [], (t: { title: string; status: string; priority: string }, i) =>
+  `${i + 1}. ${t.title} (${t.status}, ${t.priority})`
+) || 'No tasks scheduled'}
 
 Please generate a clear, professional standup update in the following format:
 
@@ -59,7 +58,7 @@ Please generate a clear, professional standup update in the following format:
 
 Keep it concise and suitable for a standup meeting. Use professional language.`;
 
-    const result = await opencodeService.chat(prompt, 'planner', true);
+    const result = await opencodeService.chat(prompt, 'planner', needsSmartModel(prompt));
     const response = result.response;
     // Save to database
     const today = new Date().toISOString().split('T')[0];
@@ -72,7 +71,7 @@ Keep it concise and suitable for a standup meeting. Use professional language.`;
   } catch (error: unknown) {
     console.error('Error generating interactive standup:', error);
     const errorMessage = error instanceof Error ? error.message : 'Failed to generate standup';
-    res.status(500).json({ error: errorMessage });
+    res.status(error instanceof ServiceUnavailableError ? 503 : 500).json({ error: errorMessage });
   }
 });
 
@@ -1,6 +1,7 @@
 import { Router, Request, Response } from 'express';
 import { db } from '../db';
 import { opencodeService } from '../services/opencodeService';
+import { ServiceUnavailableError } from '../services/retryPolicy';
 import { v4 as uuidv4 } from 'uuid';
 
 const router = Router();
@@ -23,7 +24,7 @@ router.post('/analyze', async (req: Request, res: Response) => {
   try {
     const { description, planId } = req.body;
     
-    // Call Python agent service to analyze the task
+    // Analyze the task with GLM via opencode
     const analysis = await opencodeService.analyzeTask(description);
     
     const taskId = uuidv4();
@@ -46,7 +47,7 @@ router.post('/analyze', async (req: Request, res: Response) => {
     res.json(newTask);
   } catch (error) {
     console.error('Failed to analyze task:', error);
-    res.status(500).json({ error: 'Failed to analyze task' });
+    res.status(error instanceof ServiceUnavailableError ? 503 : 500).json({ error: 'Failed to analyze task' });
   }
 });
 
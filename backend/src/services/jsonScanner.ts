@@ -0,0 +1,92 @@
+/**
+ * Incrementally finds the first balanced JSON object or array that opens with
+ * `open`. Text can be pushed in chunks as it arrives; each character is
+ * examined once. Brackets inside JSON strings are ignored.
+ */
+export class JsonValueScanner {
+  private depth = 0;
+  private inString = false;
+  private escaped = false;
+  // [start, end) of the value within the scanned text, once located
+  start = -1;
+  end = -1;
+
+  constructor(private open: '{' | '[', private text: string = '', private pos: number = 0) {}
+
+  /**
+   * Append text; returns the source of the first complete value once it has been seen
+   */
+  push(chunk: string): string | null {
+    if (this.end === -1) {
+      this.text += chunk;
+      this.scan();
+    }
+    return this.end === -1 ? null : this.text.slice(this.start, this.end);
+  }
+
+  /**
+   * Advance over the text not yet examined; returns whether the value is complete
+   */
+  scan(): boolean {
+    for (; this.end === -1 && this.pos < this.text.length; this.pos++) {
+      const ch = this.text[this.pos];
+
+      if (this.start === -1) {
+        if (ch === this.open) {
+          this.start = this.pos;
+          this.depth = 1;
+        }
+        continue;
+      }
+
+      if (this.inString) {
+        if (this.escaped) {
+          this.escaped = false;
+        } else if (ch === '\\') {
+          this.escaped = true;
+        } else if (ch === '"') {
+          this.inString = false;
+        }
+        continue;
+      }
+
+      if (ch === '"') {
+        this.inString = true;
+      } else if (ch === '{' || ch === '[') {
+        this.depth++;
+      } else if (ch === '}' || ch === ']') {
+        this.depth--;
+        if (this.depth === 0) {
+          this.end = this.pos + 1;
+        }
+      }
+    }
+    return this.end !== -1;
+  }
+}
+
+/**
+ * Locate the first balanced JSON object or array in text that opens with
+ * `open`, scanning once from fromIndex.
+ * Returns the [start, end) range of the candidate, or null if none is complete.
+ */
+export function findJsonValue(text: string, open: '{' | '[', fromIndex: number = 0): [number, number] | null {
+  const scanner = new JsonValueScanner(open, text, fromIndex);
+  return scanner.scan() ? [scanner.start, scanner.end] : null;
+}
+
+/**
+ * Parse the first balanced JSON object or array in text that is valid JSON,
+ * skipping candidates such as "[TICKET 1]" that only look like one
+ */
+export function parseFirstJson(text: string, open: '{' | '['): unknown {
+  let fromIndex = 0;
+  for (let range = findJsonValue(text, open); range; range = findJsonValue(text, open, fromIndex)) {
+    try {
+      return JSON.parse(text.slice(range[0], range[1]));
+    } catch {
+      fromIndex = range[1];
+    }
+  }
+  return undefined;
+}
@@ -1,13 +1,109 @@
 import axios from 'axios';
+import http from 'http';
+import https from 'https';
+import { Readable } from 'stream';
+import { ResponseCache, cacheKey } from './responseCache';
+import { PromptBatcher } from './promptBatcher';
+import { Semaphore } from './semaphore';
+import { CircuitBreaker, isUnsentRequestError, withRetry } from './retryPolicy';
+import { JsonValueScanner, parseFirstJson } from './jsonScanner';
+import { OpencodeEvent, SessionEventStream } from './sessionEvents';
+import { ChatResponse, ParsedTicket, TaskAnalysis } from '../types';
 
 // OpenCode server configuration
 // By default, connects to locally running opencode server
 const OPENCODE_URL = process.env.OPENCODE_URL || 'http://127.0.0.1:4096';
 
+// Shared keep-alive connection pool so every prompt reuses sockets instead of
+// paying TCP/TLS setup per call
+const OPENCODE_MAX_SOCKETS = parseInt(process.env.OPENCODE_MAX_SOCKETS || '200', 10);
+const OPENCODE_TIMEOUT_MS = parseInt(process.env.OPENCODE_TIMEOUT_MS || '120000', 10);
+
+const agentOptions = {
+  keepAlive: true,
+  maxSockets: OPENCODE_MAX_SOCKETS,
+  maxFreeSockets: Math.ceil(OPENCODE_MAX_SOCKETS / 2),
+};
+const httpAgent = new http.Agent(agentOptions);
+const httpsAgent = new https.Agent(agentOptions);
+
+const opencodeClient = axios.create({
+  baseURL: OPENCODE_URL,
+  timeout: OPENCODE_TIMEOUT_MS,
+  httpAgent,
+  httpsAgent,
+});
+
+// One shared subscription to opencode's global event bus, routed to streaming prompts by session
+const sessionEvents = new SessionEventStream(async () => {
+  const response = await opencodeClient.get<Readable>('/event', { responseType: 'stream', timeout: 0 });
+  return response.data;
+});
+
+// Upper bound on prompts in flight at once, so bursts queue here instead of
+// overrunning the model provider's rate limits. The limit is for the whole server,
+// so in cluster mode each worker gets an equal share of it (index.ts caps the
+// worker count at the limit, so every share is at least 1)
+export const OPENCODE_MAX_CONCURRENCY = parseInt(process.env.OPENCODE_MAX_CONCURRENCY || '16', 10);
+const CLUSTER_WORKER_COUNT = parseInt(process.env.CLUSTER_WORKER_COUNT || '1', 10);
+const promptSemaphore = new Semaphore(Math.max(1, Math.floor(OPENCODE_MAX_CONCURRENCY / CLUSTER_WORKER_COUNT)));
+
+// Transient opencode failures are retried with backoff; after repeated failures
+// the breaker fails fast for a while instead of piling more load onto the server
+const RETRY_OPTIONS = { attempts: 3, initialDelayMs: 500, maxDelayMs: 8000 };
+const opencodeBreaker = new CircuitBreaker(5, 10000);
+
+interface OpencodePostOptions {
+  // Which failures to retry; defaults to every transient failure
+  shouldRetry?: (error: unknown) => boolean;
+  // Held for each attempt only, so backoff sleeps do not occupy a slot
+  semaphore?: Semaphore;
+}
+
+/**
+ * POST to the opencode server with retries, behind the circuit breaker
+ */
+function opencodePost<T = unknown>(url: string, body: unknown, options: OpencodePostOptions = {}) {
+  const { shouldRetry, semaphore } = options;
+  const post = () => opencodeClient.post<T>(url, body);
+  const attempt = semaphore ? () => semaphore.run(post) : post;
+  return opencodeBreaker.call(() => withRetry(attempt, RETRY_OPTIONS, shouldRetry));
+}
+
+// Cache of AI responses keyed by prompt inputs, so repeated prompts skip the model
+const AI_CACHE_MAX_ENTRIES = parseInt(process.env.AI_CACHE_MAX_ENTRIES || '1024', 10);
+const AI_CACHE_TTL_MS = parseInt(process.env.AI_CACHE_TTL_MS || '3600000', 10);
+const responseCache = new ResponseCache(AI_CACHE_MAX_ENTRIES, AI_CACHE_TTL_MS);
+
+// Concurrent parse-ticket / analyze-task calls arriving within AI_BATCH_MAX_WAIT_MS
+// are combined into a single prompt of up to AI_BATCH_MAX_SIZE items
+const AI_BATCH_MAX_SIZE = parseInt(process.env.AI_BATCH_MAX_SIZE || '8', 10);
+const AI_BATCH_MAX_WAIT_MS = parseInt(process.env.AI_BATCH_MAX_WAIT_MS || '25', 10);
+
 // Model configuration
 const MODEL_SMART = process.env.OPENCODE_MODEL_SMART || 'zai-coding-plan/glm-5';
 const MODEL_FAST = process.env.OPENCODE_MODEL_FAST || 'zai-coding-plan/glm-4.7';
 
+// Model names callers may request
+export const MODEL_NAMES = ['glm-4.7', 'glm-5'] as const;
+export type ModelName = typeof MODEL_NAMES[number];
+
+export function isModelName(value: unknown): value is ModelName {
+  return typeof value === 'string' && (MODEL_NAMES as readonly string[]).includes(value);
+}
+
+// Prompts shorter than this (roughly 1000 tokens) are simple enough for the fast
+// model; longer ones go to the smart (reasoning) model
+const SMART_PROMPT_CHARS = 4000;
+
+// Tickets with descriptions longer than this always get the smart model, since
+// the prompt only carries a truncated description
+const SMART_TICKET_DESCRIPTION_CHARS = 1500;
+
+// Bounds on ticket data embedded in prompts, to keep input tokens in check
+const PROMPT_DESCRIPTION_CHARS = 500;
+const PROMPT_MAX_LIST_ITEMS = 20;
+
 // Agent system prompts
 const AGENT_PROMPTS: Record<string, string> = {
   project: `You are the Project Architect agent. You help with backend, database, and overall project structure.
@@ -23,29 +119,43 @@ You provide structured plans, identify dependencies, estimate effort, and sugges
 You help with complex debugging, performance optimization, and advanced technical challenges.`,
 };
 
-interface ChatResponse {
-  response: string;
-  model: string;
-  agentType: string;
+// Chat prompt prefixes (system prompt + user turn marker), built once per agent
+const CHAT_PROMPT_PREFIXES: Record<string, string> = Object.fromEntries(
+  Object.entries(AGENT_PROMPTS).map(([agentType, systemPrompt]) => [agentType, `${systemPrompt}\n\nUser: `])
+);
+
+function chatPrompt(agentType: string, message: string): string {
+  return (CHAT_PROMPT_PREFIXES[agentType] || CHAT_PROMPT_PREFIXES.planner) + message;
+}
+
+interface TicketInput {
+  ticketKey: string;
+  ticketData: Record<string, unknown>;
 }
 
-interface ParsedTicket {
-  key: string;
+// The Jira fields the ticket prompts use, read out of the raw payload once
+interface TicketFields {
   summary: string;
-  status: string;
-  priority: string;
+  status?: string;
+  priority?: string;
   description: string;
   assignee?: string;
-  story_points?: number;
   labels: string[];
   components: string[];
-  raw_analysis: string;
 }
 
-interface TaskAnalysis {
-  title: string;
-  priority: string;
-  description: string;
+interface TicketPrompt {
+  ticketKey: string;
+  ticket: TicketFields;
+}
+
+interface PromptOptions {
+  // Serve from / store in the response cache
+  useCache?: boolean;
+  // Use the smart model where the fast one is the default
+  useSmartModel?: boolean;
+  // Force this model instead of routing on prompt size
+  model?: ModelName;
 }
 
 /**
@@ -61,26 +171,237 @@ function extractTextFromParts(parts: Array<{ type: string; text?: string }>): st
   return text;
 }
 
+// Expected type of each field in a structured model reply
+type FieldType = 'string' | 'number' | 'string[]';
+type ResponseSchema<T> = { [K in keyof T]-?: FieldType };
+
+const PARSED_TICKET_SCHEMA: ResponseSchema<ParsedTicket> = {
+  key: 'string',
+  summary: 'string',
+  status: 'string',
+  priority: 'string',
+  description: 'string',
+  assignee: 'string',
+  story_points: 'number',
+  labels: 'string[]',
+  components: 'string[]',
+  raw_analysis: 'string',
+};
+
+const TASK_ANALYSIS_SCHEMA: ResponseSchema<TaskAnalysis> = {
+  title: 'string',
+  priority: 'string',
+  description: 'string',
+};
+
+function matchesType(value: unknown, type: FieldType): boolean {
+  if (type === 'number') {
+    return typeof value === 'number' && Number.isFinite(value);
+  }
+  if (type === 'string[]') {
+    return Array.isArray(value) && value.every(v => typeof v === 'string');
+  }
+  return typeof value === 'string';
+}
+
+function isRecord(value: unknown): value is Record<string, unknown> {
+  return typeof value === 'object' && value !== null && !Array.isArray(value);
+}
+
+// Results built without any usable model output; these are returned but never cached
+const fallbackResults = new WeakSet<object>();
+
+/**
+ * Build a typed result from a parsed model reply, taking each field from the
+ * reply when it has the schema type and from fallback otherwise
+ */
+function fromSchema<T extends object>(value: unknown, schema: ResponseSchema<T>, fallback: T): T {
+  const result = { ...fallback };
+  let usedReply = false;
+  if (isRecord(value)) {
+    for (const field of Object.keys(schema) as Array<keyof T>) {
+      const fieldValue = value[field as string];
+      if (matchesType(fieldValue, schema[field])) {
+        result[field] = fieldValue as T[keyof T];
+        usedReply = true;
+      }
+    }
+  }
+  if (!usedReply) {
+    fallbackResults.add(result);
+  }
+  return result;
+}
+
 /**
  * Try to parse JSON from text response
  */
-function tryParseJson<T>(text: string, fallback: T): T {
-  try {
-    const jsonStart = text.indexOf('{');
-    const jsonEnd = text.lastIndexOf('}');
-    if (jsonStart !== -1 && jsonEnd !== -1) {
-      const jsonStr = text.slice(jsonStart, jsonEnd + 1);
-      return JSON.parse(jsonStr) as T;
+function tryParseJson(text: string): unknown {
+  return parseFirstJson(text, '{');
+}
+
+/**
+ * Try to parse a JSON array from text response
+ */
+function tryParseJsonArray(text: string): unknown[] | null {
+  const parsed = parseFirstJson(text, '[');
+  return Array.isArray(parsed) ? parsed : null;
+}
+
+/**
+ * Route short prompts to the fast model unless a model is forced
+ */
+function pickModelId(prompt: string, override?: string): string {
+  return override || (prompt.length < SMART_PROMPT_CHARS ? 'glm-4.7' : 'glm-5');
+}
+
+/**
+ * Whether a prompt is long enough to be worth the smart model
+ */
+export function needsSmartModel(prompt: string): boolean {
+  return pickModelId(prompt) === 'glm-5';
+}
+
+function ticketModelOverride(ticket: TicketFields): string | undefined {
+  return ticket.description.length > SMART_TICKET_DESCRIPTION_CHARS ? 'glm-5' : undefined;
+}
+
+/**
+ * Model for a ticket parsed on its own with the given prompt
+ */
+function ticketModelId(prompt: string, ticket: TicketFields): string {
+  return pickModelId(prompt, ticketModelOverride(ticket));
+}
+
+function normalizeTicketFields(ticketData: Record<string, unknown>): TicketFields {
+  const fields = (ticketData.fields as Record<string, unknown>) || {};
+  const optionalName = (value: unknown, key: string): string | undefined => {
+    const name = (value as Record<string, unknown> | null | undefined)?.[key];
+    return name ? String(name) : undefined;
+  };
+
+  return {
+    summary: String(fields.summary || ''),
+    status: optionalName(fields.status, 'name'),
+    priority: optionalName(fields.priority, 'name'),
+    description: String(fields.description || ''),
+    assignee: optionalName(fields.assignee, 'displayName'),
+    labels: (fields.labels as string[]) || [],
+    components: ((fields.components as Array<Record<string, unknown>>) || []).map(c => String(c.name)),
+  };
+}
+
+/**
+ * Cut text to at most maxChars, marking where it was truncated
+ */
+function shorten(value: unknown, maxChars: number): string {
+  const text = String(value ?? '');
+  return text.length <= maxChars ? text : `${text.slice(0, maxChars)}…[truncated]`;
+}
+
+/**
+ * Describe the relevant ticket fields for a prompt, bounded in size and
+ * leaving out fields that are empty
+ */
+function describeTicket(ticketKey: string, ticket: TicketFields): string {
+  const labels = ticket.labels.slice(0, PROMPT_MAX_LIST_ITEMS);
+  const components = ticket.components.slice(0, PROMPT_MAX_LIST_ITEMS);
+
+  const rows: Array<[string, unknown]> = [
+    ['Summary', ticket.summary],
+    ['Status', ticket.status],
+    ['Priority', ticket.priority],
+    ['Description', ticket.description && shorten(ticket.description, PROMPT_DESCRIPTION_CHARS)],
+    ['Assignee', ticket.assignee || 'Unassigned'],
+    ['Labels', labels.length > 0 && JSON.stringify(labels)],
+    ['Components', components.length > 0 && JSON.stringify(components)],
+  ];
+
+  let description = `Ticket Key: ${ticketKey}\nRaw Data:`;
+  for (const [label, value] of rows) {
+    if (value) {
+      description += `\n- ${label}: ${value}`;
     }
-  } catch {
-    // Ignore parse errors
   }
-  return fallback;
+  return description;
+}
+
+function parsedTicketShape(ticketKey: string): string {
+  return `{"key": "${ticketKey}", "summary": "brief summary", "status": "status", "priority": "High/Medium/Low", "description": "description", "assignee": "name", "story_points": null, "labels": [], "components": [], "raw_analysis": "your analysis"}`;
+}
+
+const BATCH_TICKET_SHAPE = parsedTicketShape('TICKET-KEY');
+
+const TASK_ANALYSIS_SHAPE = '{"title": "concise title", "priority": "High/Medium/Low", "description": "what needs to be done"}';
+
+// Instruction lists shared by the single and batched prompts
+const TICKET_ANALYSIS_STEPS = `1. A brief analysis of what this ticket is about
+2. Any potential blockers or dependencies
+3. Estimated complexity
+4. Suggested approach`;
+
+const TASK_EXTRACTION_STEPS = `1. A concise title (max 50 characters)
+2. Priority (High/Medium/Low) based on urgency keywords
+3. A brief description of what needs to be done`;
+
+/**
+ * Prompt for parsing one ticket on its own
+ */
+function parseTicketPrompt(ticketKey: string, ticket: TicketFields): string {
+  return `Analyze this Jira ticket and extract structured information.
+
+${describeTicket(ticketKey, ticket)}
+
+Provide:
+${TICKET_ANALYSIS_STEPS}
+
+Return a JSON object with these fields EXACTLY:
+${parsedTicketShape(ticketKey)}
+
+Return ONLY valid JSON, no markdown.`;
+}
+
+/**
+ * Ticket built straight from Jira fields, used for anything the model reply is missing
+ */
+function ticketFallback(ticketKey: string, ticket: TicketFields, responseText: string): ParsedTicket {
+  return {
+    key: ticketKey,
+    summary: ticket.summary,
+    status: ticket.status || 'Unknown',
+    priority: ticket.priority || 'Medium',
+    description: ticket.description.slice(0, 500),
+    assignee: ticket.assignee,
+    story_points: undefined,
+    labels: ticket.labels,
+    components: ticket.components,
+    raw_analysis: responseText,
+  };
+}
+
+function taskFallback(description: string): TaskAnalysis {
+  return {
+    title: description.slice(0, 50),
+    priority: 'Medium',
+    description,
+  };
 }
 
 class OpenCodeService {
+  private ticketBatcher = new PromptBatcher<TicketPrompt, ParsedTicket>({
+    maxBatchSize: AI_BATCH_MAX_SIZE,
+    maxWaitMs: AI_BATCH_MAX_WAIT_MS,
+    runBatch: inputs => this.runParseTicketBatch(inputs),
+  });
+
+  private taskBatcher = new PromptBatcher<string, TaskAnalysis>({
+    maxBatchSize: AI_BATCH_MAX_SIZE,
+    maxWaitMs: AI_BATCH_MAX_WAIT_MS,
+    runBatch: inputs => this.runAnalyzeTaskBatch(inputs),
+  });
+
   private async createSession(title: string): Promise<string> {
-    const response = await axios.post(`${OPENCODE_URL}/session`, { title });
+    const response = await opencodePost<{ id: string }>('/session', { title });
     return response.data.id;
   }
 
@@ -94,25 +415,161 @@ class OpenCodeService {
       body.model = { providerID: 'zai-coding-plan', modelID: modelId };
     }
     
-    const response = await axios.post(`${OPENCODE_URL}/session/${sessionId}/prompt`, body);
+    // Prompts are not idempotent: once opencode has the request it may already have
+    // stored the turn and started the model, so only connection failures are retried
+    const response = await opencodePost<{ parts?: Array<{ type: string; text?: string }> }>(
+      `/session/${sessionId}/prompt`,
+      body,
+      { shouldRetry: isUnsentRequestError, semaphore: promptSemaphore }
+    );
     return extractTextFromParts(response.data.parts || []);
   }
 
+  /**
+   * Send a prompt, calling onDelta with assistant text as opencode generates it.
+   * Resolves with the complete response text once the prompt finishes, or with
+   * the text streamed so far as soon as onDelta returns true, aborting the rest
+   * of the generation. Aborting signal also stops the deltas and the generation.
+   * Without an event stream it degrades to a plain prompt.
+   */
+  private async streamPrompt(
+    sessionId: string,
+    parts: Array<{ type: string; text: string }>,
+    modelId: string | undefined,
+    onDelta: (delta: string) => boolean | void,
+    signal?: AbortSignal
+  ): Promise<string> {
+    const assistantMessages = new Set<string>();
+    const partTexts = new Map<string, string>();
+    let streamedText = '';
+    let stopEarly!: () => void;
+    const stopped = new Promise<void>(resolve => {
+      stopEarly = () => resolve();
+    });
+
+    const handleEvent = (event: OpencodeEvent) => {
+      const { info, part, delta } = event.properties || {};
+      if (event.type === 'message.updated' && info?.role === 'assistant') {
+        assistantMessages.add(info.id);
+      } else if (event.type === 'message.part.updated' && part?.type === 'text' && assistantMessages.has(part.messageID)) {
+        const previous = partTexts.get(part.id) || '';
+        const text = part.text || '';
+        partTexts.set(part.id, text);
+        const chunk = typeof delta === 'string' ? delta : text.slice(previous.length);
+        if (chunk) {
+          streamedText += chunk;
+          if (onDelta(chunk) === true) {
+            stopEarly();
+          }
+        }
+      }
+    };
+
+    let unsubscribe = () => {};
+    try {
+      unsubscribe = await sessionEvents.subscribe(sessionId, handleEvent);
+    } catch (error) {
+      console.error('OpenCode event stream unavailable:', error instanceof Error ? error.message : error);
+    }
+
+    if (signal?.aborted) {
+      unsubscribe();
+      throw new Error('Prompt aborted');
+    }
+    const onAbort = () => {
+      unsubscribe();
+      this.abortSession(sessionId);
+    };
+    signal?.addEventListener('abort', onAbort, { once: true });
+
+    const prompt = this.sendPrompt(sessionId, parts, modelId);
+    try {
+      const finished = await Promise.race([prompt.then(() => true), stopped.then(() => false)]);
+      if (finished) {
+        return await prompt;
+      }
+      // The caller has what it needs; stop the model generating the rest
+      prompt.catch(() => undefined);
+      this.abortSession(sessionId);
+      return streamedText;
+    } finally {
+      signal?.removeEventListener('abort', onAbort);
+      unsubscribe();
+    }
+  }
+
+  /**
+   * Stop whatever the model is generating in a session
+   */
+  private abortSession(sessionId: string): void {
+    opencodeClient.post(`/session/${sessionId}/abort`).catch(error => {
+      console.error('Failed to abort OpenCode session:', error instanceof Error ? error.message : error);
+    });
+  }
+
+  /**
+   * Run compute through the response cache when useCache is set
+   */
+  private cached<T>(key: string, useCache: boolean, compute: () => Promise<T>): Promise<T> {
+    // A fallback stands in for one bad reply; caching it would serve it for the whole TTL
+    const cacheable = (value: T) => !(typeof value === 'object' && value !== null && fallbackResults.has(value));
+    return useCache ? responseCache.getOrCompute(key, compute, cacheable) : compute();
+  }
+
+  /**
+   * Release pooled connections to the opencode server
+   */
+  close(): void {
+    sessionEvents.close();
+    httpAgent.destroy();
+    httpsAgent.destroy();
+  }
+
   /**
    * Send a chat message to an AI agent
    */
-  async chat(message: string, agentType: string = 'planner', useSmartModel: boolean = false): Promise<ChatResponse> {
+  async chat(message: string, agentType: string = 'planner', useSmartModel: boolean = false, options: PromptOptions = {}): Promise<ChatResponse> {
     const model = useSmartModel ? MODEL_SMART : MODEL_FAST;
     const modelId = useSmartModel ? 'glm-5' : 'glm-4.7';
-    const systemPrompt = AGENT_PROMPTS[agentType] || AGENT_PROMPTS.planner;
 
-    // Create session
-    const sessionId = await this.createSession(`Chat - ${agentType}`);
+    return this.cached(cacheKey('chat', [agentType, modelId, message]), options.useCache ?? false, async () => {
+      // Create session
+      const sessionId = await this.createSession(`Chat - ${agentType}`);
+
+      // Send system prompt + user message together
+      const responseText = await this.sendPrompt(sessionId, [
+        { type: 'text', text: chatPrompt(agentType, message) }
+      ], modelId);
+
+      return {
+        response: responseText,
+        model,
+        agentType,
+      };
+    });
+  }
 
-    // Send system prompt + user message together
-    const responseText = await this.sendPrompt(sessionId, [
-      { type: 'text', text: `${systemPrompt}\n\nUser: ${message}` }
-    ], modelId);
+  /**
+   * Send a chat message to an AI agent, passing response text to onDelta as it is generated.
+   * Aborting signal, e.g. when the client disconnects, stops the generation.
+   */
+  async chatStream(
+    message: string,
+    agentType: string,
+    useSmartModel: boolean,
+    onDelta: (delta: string) => void,
+    signal?: AbortSignal
+  ): Promise<ChatResponse> {
+    const model = useSmartModel ? MODEL_SMART : MODEL_FAST;
+    const modelId = useSmartModel ? 'glm-5' : 'glm-4.7';
+
+    const sessionId = await this.createSession(`Chat - ${agentType}`);
+    const responseText = await this.streamPrompt(sessionId, [
+      { type: 'text', text: chatPrompt(agentType, message) }
+    ], modelId, delta => {
+      // Chat always reads to the end of the reply
+      onDelta(delta);
+    }, signal);
 
     return {
       response: responseText,
@@ -124,107 +581,143 @@ class OpenCodeService {
   /**
    * Parse a Jira ticket and extract structured information
    */
-  async parseTicket(ticketKey: string, ticketData: Record<string, unknown>): Promise<ParsedTicket> {
-    const fields = (ticketData.fields as Record<string, unknown>) || {};
+  async parseTicket(ticketKey: string, ticketData: Record<string, unknown>, options: PromptOptions = {}): Promise<ParsedTicket> {
+    const ticket = normalizeTicketFields(ticketData);
+    // The routed model is a function of the ticket, so only a forced model needs its own key.
+    // Forced models bypass the batcher, which routes the whole batch on its tickets
+    const forcedModel = options.model ?? (options.useSmartModel ? 'glm-5' : undefined);
+    return this.cached(cacheKey('parse-ticket', [ticketKey, forcedModel ?? 'auto', ticket]), options.useCache ?? true, () =>
+      forcedModel ? this.runParseTicket(ticketKey, ticket, forcedModel) : this.ticketBatcher.submit({ ticketKey, ticket })
+    );
+  }
+
+  private async runParseTicket(ticketKey: string, ticket: TicketFields, modelOverride?: string): Promise<ParsedTicket> {
+    const prompt = parseTicketPrompt(ticketKey, ticket);
+    const sessionId = await this.createSession(`Parse Ticket - ${ticketKey}`);
+    const modelId = modelOverride ?? ticketModelId(prompt, ticket);
+    // Stream the reply and stop as soon as the JSON object is complete, rather
+    // than waiting for any trailing text the model adds after it
+    const scanner = new JsonValueScanner('{');
+    const responseText = await this.streamPrompt(sessionId, [{ type: 'text', text: prompt }], modelId, delta => {
+      const json = scanner.push(delta);
+      return json !== null && isRecord(tryParseJson(json));
+    });
+    
+    // Try to parse JSON from response
+    return fromSchema(tryParseJson(responseText), PARSED_TICKET_SCHEMA, ticketFallback(ticketKey, ticket, responseText));
+  }
+
+  /**
+   * Parse several tickets with one prompt; tickets missing from the reply are parsed individually
+   */
+  private async runParseTicketBatch(inputs: TicketPrompt[]): Promise<ParsedTicket[]> {
+    if (inputs.length === 1) {
+      return [await this.runParseTicket(inputs[0].ticketKey, inputs[0].ticket)];
+    }
 
-    const prompt = `Analyze this Jira ticket and extract structured information.
+    const tickets = inputs
+      .map((input, i) => `[TICKET ${i + 1}]\n${describeTicket(input.ticketKey, input.ticket)}`)
+      .join('\n\n');
 
-Ticket Key: ${ticketKey}
-Raw Data:
-- Summary: ${fields.summary || 'N/A'}
-- Status: ${(fields.status as Record<string, unknown>)?.name || 'N/A'}
-- Priority: ${(fields.priority as Record<string, unknown>)?.name || 'N/A'}
-- Description: ${String(fields.description || 'N/A').slice(0, 500)}
-- Assignee: ${(fields.assignee as Record<string, unknown>)?.displayName || 'Unassigned'}
-- Labels: ${JSON.stringify(fields.labels || [])}
-- Components: ${JSON.stringify(((fields.components as Array<Record<string, unknown>>) || []).map(c => c.name))}
+    const prompt = `Analyze each of these Jira tickets and extract structured information.
 
-Provide:
-1. A brief analysis of what this ticket is about
-2. Any potential blockers or dependencies
-3. Estimated complexity
-4. Suggested approach
+${tickets}
 
-Return a JSON object with these fields EXACTLY:
-{"key": "${ticketKey}", "summary": "brief summary", "status": "status", "priority": "High/Medium/Low", "description": "description", "assignee": "name", "story_points": null, "labels": [], "components": [], "raw_analysis": "your analysis"}
+For each ticket provide:
+${TICKET_ANALYSIS_STEPS}
+
+Return a JSON array with one object per ticket, in the same order, each with these fields EXACTLY:
+${BATCH_TICKET_SHAPE}
 
 Return ONLY valid JSON, no markdown.`;
 
-    const sessionId = await this.createSession(`Parse Ticket - ${ticketKey}`);
-    const responseText = await this.sendPrompt(sessionId, [{ type: 'text', text: prompt }], 'glm-5');
-    
-    // Try to parse JSON from response
-    const fallback: ParsedTicket = {
-      key: ticketKey,
-      summary: String(fields.summary || ''),
-      status: String((fields.status as Record<string, unknown>)?.name || 'Unknown'),
-      priority: String((fields.priority as Record<string, unknown>)?.name || 'Medium'),
-      description: String(fields.description || '').slice(0, 500),
-      assignee: (fields.assignee as Record<string, unknown>)?.displayName as string | undefined,
-      story_points: undefined,
-      labels: (fields.labels as string[]) || [],
-      components: ((fields.components as Array<Record<string, unknown>>) || []).map(c => String(c.name)),
-      raw_analysis: responseText,
-    };
-    
-    return tryParseJson(responseText, fallback);
+    // Route on each ticket's own prompt, not the combined one, so coalescing short
+    // tickets keeps them on the fast model; one ticket needing glm-5 upgrades the batch
+    const modelId = inputs.some(input =>
+      ticketModelId(parseTicketPrompt(input.ticketKey, input.ticket), input.ticket) === 'glm-5'
+    ) ? 'glm-5' : 'glm-4.7';
+    const sessionId = await this.createSession(`Parse Tickets - ${inputs.length}`);
+    const responseText = await this.sendPrompt(sessionId, [{ type: 'text', text: prompt }], modelId);
+    const results = (tryParseJsonArray(responseText) || []).filter(isRecord);
+
+    return Promise.all(inputs.map(input => {
+      const parsed = results.find(r => r.key === input.ticketKey);
+      if (!parsed) {
+        return this.runParseTicket(input.ticketKey, input.ticket);
+      }
+      return fromSchema(parsed, PARSED_TICKET_SCHEMA, ticketFallback(input.ticketKey, input.ticket, responseText));
+    }));
+  }
+
+  /**
+   * Parse several Jira tickets concurrently
+   */
+  async parseTickets(tickets: TicketInput[], options: PromptOptions = {}): Promise<ParsedTicket[]> {
+    return Promise.all(tickets.map(t => this.parseTicket(t.ticketKey, t.ticketData, options)));
   }
 
   /**
    * Analyze a manual task description
+   * Uses the fast model unless useSmartModel is set; only fast-model calls are batched
    */
-  async analyzeTask(description: string): Promise<TaskAnalysis> {
+  async analyzeTask(description: string, options: PromptOptions = {}): Promise<TaskAnalysis> {
+    const modelId = options.useSmartModel ? 'glm-5' : 'glm-4.7';
+    return this.cached(cacheKey('analyze-task', [modelId, description]), options.useCache ?? true, () =>
+      options.useSmartModel ? this.runAnalyzeTask(description, modelId) : this.taskBatcher.submit(description)
+    );
+  }
+
+  private async runAnalyzeTask(description: string, modelId: string = 'glm-4.7'): Promise<TaskAnalysis> {
     const prompt = `Analyze this task description and extract structured information.
 
 Task Description: ${description}
 
 Extract:
-1. A concise title (max 50 characters)
-2. Priority (High/Medium/Low) based on urgency keywords
-3. A brief description of what needs to be done
+${TASK_EXTRACTION_STEPS}
 
 Return ONLY a JSON object EXACTLY:
-{"title": "concise title", "priority": "High/Medium/Low", "description": "what needs to be done"}
+${TASK_ANALYSIS_SHAPE}
 
 No markdown, just valid JSON.`;
 
     const sessionId = await this.createSession('Analyze Task');
-    const responseText = await this.sendPrompt(sessionId, [{ type: 'text', text: prompt }], 'glm-4.7');
+    const responseText = await this.sendPrompt(sessionId, [{ type: 'text', text: prompt }], modelId);
     
     // Try to parse JSON from response
-    const fallback: TaskAnalysis = {
-      title: description.slice(0, 50),
-      priority: 'Medium',
-      description,
-    };
-    
-    return tryParseJson(responseText, fallback);
+    return fromSchema(tryParseJson(responseText), TASK_ANALYSIS_SCHEMA, taskFallback(description));
   }
 
   /**
-   * Generate standup notes
+   * Analyze several task descriptions with one prompt; tasks missing from the reply are analyzed individually
    */
-  async generateStandup(yesterdayLogs: Array<{ description: string; duration_minutes: number }>, todayTickets: Array<{ key: string; summary: string; status: string }>): Promise<string> {
-    const yesterdaySummary = yesterdayLogs.length > 0
-      ? yesterdayLogs.map(log => `- ${log.description} (${log.duration_minutes}m)`).join('\n')
-      : 'No work logged';
+  private async runAnalyzeTaskBatch(descriptions: string[]): Promise<TaskAnalysis[]> {
+    if (descriptions.length === 1) {
+      return [await this.runAnalyzeTask(descriptions[0])];
+    }
 
-    const todaySummary = todayTickets.length > 0
-      ? todayTickets.map(t => `- [${t.key}] ${t.summary} (${t.status})`).join('\n')
-      : 'No tickets planned';
+    const tasks = descriptions.map((description, i) => `[TASK ${i + 1}]\n${description}`).join('\n\n');
 
-    const prompt = `Generate a concise standup update for me.
+    const prompt = `Analyze each of these task descriptions and extract structured information.
 
-Yesterday I worked on:
-${yesterdaySummary}
+${tasks}
 
-Today I plan to work on:
-${todaySummary}
+For each task extract:
+${TASK_EXTRACTION_STEPS}
 
-Format with **Yesterday:**, **Today:**, **Blockers:** sections.`;
+Return ONLY a JSON array with one object per task, in the same order, each EXACTLY:
+${TASK_ANALYSIS_SHAPE}
 
-    const sessionId = await this.createSession('Generate Standup');
-    return this.sendPrompt(sessionId, [{ type: 'text', text: prompt }], 'glm-5');
+No markdown, just valid JSON.`;
+
+    const sessionId = await this.createSession(`Analyze Tasks - ${descriptions.length}`);
+    const responseText = await this.sendPrompt(sessionId, [{ type: 'text', text: prompt }], 'glm-4.7');
+    const results = tryParseJsonArray(responseText);
+
+    // Positions are only trustworthy if the model answered every task
+    if (!results || results.length !== descriptions.length) {
+      return Promise.all(descriptions.map(description => this.runAnalyzeTask(description)));
+    }
+    return results.map((result, i) => fromSchema(result, TASK_ANALYSIS_SCHEMA, taskFallback(descriptions[i])));
   }
 }
 
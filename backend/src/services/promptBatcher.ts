@@ -0,0 +1,66 @@
+interface PendingItem<I, O> {
+  input: I;
+  resolve: (value: O) => void;
+  reject: (reason: unknown) => void;
+}
+
+interface PromptBatcherOptions<I, O> {
+  // Largest number of items combined into one batch
+  maxBatchSize: number;
+  // How long the first queued item waits for company before the batch is sent
+  maxWaitMs: number;
+  // Process a batch; must return one result per input, in the same order
+  runBatch: (inputs: I[]) => Promise<O[]>;
+}
+
+/**
+ * Coalesces concurrent requests into batches, so several callers arriving within
+ * a short window share a single model round trip.
+ */
+export class PromptBatcher<I, O> {
+  private queue: Array<PendingItem<I, O>> = [];
+  private timer: NodeJS.Timeout | null = null;
+
+  constructor(private options: PromptBatcherOptions<I, O>) {}
+
+  submit(input: I): Promise<O> {
+    return new Promise<O>((resolve, reject) => {
+      this.queue.push({ input, resolve, reject });
+
+      if (this.queue.length >= this.options.maxBatchSize) {
+        this.flush();
+      } else if (!this.timer) {
+        this.timer = setTimeout(() => this.flush(), this.options.maxWaitMs);
+      }
+    });
+  }
+
+  private flush(): void {
+    if (this.timer) {
+      clearTimeout(this.timer);
+      this.timer = null;
+    }
+
+    const batch = this.queue.splice(0, this.options.maxBatchSize);
+    if (this.queue.length > 0) {
+      this.timer = setTimeout(() => this.flush(), this.options.maxWaitMs);
+    }
+    if (batch.length === 0) {
+      return;
+    }
+
+    this.options.runBatch(batch.map(item => item.input))
+      .then(results => {
+        batch.forEach((item, i) => {
+          if (i < results.length) {
+            item.resolve(results[i]);
+          } else {
+            item.reject(new Error('Batch returned fewer results than inputs'));
+          }
+        });
+      })
+      .catch(error => {
+        batch.forEach(item => item.reject(error));
+      });
+  }
+}
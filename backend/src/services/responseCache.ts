@@ -0,0 +1,137 @@
+import crypto from 'crypto';
+import type Database from 'better-sqlite3';
+import { db } from '../db';
+
+interface CacheEntry<T> {
+  value: T;
+  expiresAt: number;
+}
+
+// Expired rows are swept from the shared table once every this many writes
+const PRUNE_EVERY_WRITES = 100;
+
+/**
+ * LRU cache with per-entry TTL, kept in memory and written through to SQLite so
+ * every server process (and restarts) share hits.
+ * Map preserves insertion order, so the first key is always the least recently used.
+ */
+export class ResponseCache<T = unknown> {
+  private entries = new Map<string, CacheEntry<T>>();
+  private statements: { select: Database.Statement; upsert: Database.Statement; prune: Database.Statement } | null = null;
+  private writes = 0;
+
+  constructor(private maxSize: number = 1024, private ttlMs: number = 60 * 60 * 1000) {}
+
+  get(key: string): T | undefined {
+    const entry = this.entries.get(key);
+    if (!entry) {
+      return undefined;
+    }
+    if (entry.expiresAt <= Date.now()) {
+      this.entries.delete(key);
+      return undefined;
+    }
+    // Refresh recency
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    return entry.value;
+  }
+
+  set(key: string, value: T, expiresAt: number = Date.now() + this.ttlMs): void {
+    this.entries.delete(key);
+    this.entries.set(key, { value, expiresAt });
+    if (this.entries.size > this.maxSize) {
+      const oldest = this.entries.keys().next().value;
+      if (oldest !== undefined) {
+        this.entries.delete(oldest);
+      }
+    }
+  }
+
+  /**
+   * Return the cached value for key, or compute it and store it when cacheable accepts it
+   */
+  async getOrCompute<V extends T>(
+    key: string,
+    compute: () => Promise<V>,
+    cacheable: (value: V) => boolean = () => true
+  ): Promise<V> {
+    const cached = this.get(key) ?? this.getShared(key);
+    if (cached !== undefined) {
+      return cached as V;
+    }
+    const value = await compute();
+    if (!cacheable(value)) {
+      return value;
+    }
+    this.set(key, value);
+    this.setShared(key, value);
+    return value;
+  }
+
+  // Statements are prepared on first use, after initDB has created the table
+  private sharedStatements() {
+    if (!this.statements) {
+      this.statements = {
+        select: db.prepare('SELECT value, expires_at FROM ai_response_cache WHERE key = ? AND expires_at > ?'),
+        upsert: db.prepare('INSERT OR REPLACE INTO ai_response_cache (key, value, expires_at) VALUES (?, ?, ?)'),
+        prune: db.prepare('DELETE FROM ai_response_cache WHERE expires_at <= ?'),
+      };
+    }
+    return this.statements;
+  }
+
+  private getShared(key: string): T | undefined {
+    try {
+      const row = this.sharedStatements().select.get(key, Date.now()) as { value: string; expires_at: number } | undefined;
+      if (!row) {
+        return undefined;
+      }
+      const value = JSON.parse(row.value) as T;
+      this.set(key, value, row.expires_at);
+      return value;
+    } catch (error) {
+      // The shared tier is an optimization; fall back to computing the value
+      console.error('Response cache read failed:', error);
+      return undefined;
+    }
+  }
+
+  private setShared(key: string, value: T): void {
+    try {
+      const statements = this.sharedStatements();
+      const now = Date.now();
+      statements.upsert.run(key, JSON.stringify(value), now + this.ttlMs);
+      if (++this.writes % PRUNE_EVERY_WRITES === 0) {
+        statements.prune.run(now);
+      }
+    } catch (error) {
+      console.error('Response cache write failed:', error);
+    }
+  }
+}
+
+/**
+ * JSON with object keys sorted, so equal values always serialize identically
+ */
+function canonicalJson(value: unknown): string {
+  return JSON.stringify(value, (_key, v: unknown) => {
+    if (typeof v !== 'object' || v === null || Array.isArray(v)) {
+      return v;
+    }
+    const record = v as Record<string, unknown>;
+    const sorted: Record<string, unknown> = {};
+    for (const key of Object.keys(record).sort()) {
+      sorted[key] = record[key];
+    }
+    return sorted;
+  });
+}
+
+/**
+ * Build a cache key from its parts, hashing anything that may be large
+ */
+export function cacheKey(namespace: string, parts: unknown[]): string {
+  const digest = crypto.createHash('blake2b512').update(canonicalJson(parts)).digest('hex');
+  return `${namespace}:${digest}`;
+}
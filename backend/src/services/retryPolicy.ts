@@ -0,0 +1,116 @@
+import axios from 'axios';
+
+// Network failures where the request never reached, or never got an answer from, the server
+const RETRYABLE_NETWORK_CODES = new Set(['ECONNREFUSED', 'ECONNRESET', 'EPIPE', 'EAI_AGAIN', 'ENOTFOUND']);
+
+// Connection failures that happen before any of the request is sent
+const UNSENT_NETWORK_CODES = new Set(['ECONNREFUSED', 'EAI_AGAIN', 'ENOTFOUND']);
+
+/**
+ * Whether an error is a transient upstream failure worth retrying.
+ * Timeouts are excluded: the server may still be working on the prompt.
+ */
+export function isRetryableError(error: unknown): boolean {
+  if (!axios.isAxiosError(error)) {
+    return false;
+  }
+  if (error.response) {
+    const status = error.response.status;
+    return status === 429 || status >= 500;
+  }
+  return error.code !== undefined && RETRYABLE_NETWORK_CODES.has(error.code);
+}
+
+/**
+ * Whether a request failed before reaching the server, so it is safe to retry
+ * even when it is not idempotent
+ */
+export function isUnsentRequestError(error: unknown): boolean {
+  return axios.isAxiosError(error) && !error.response && error.code !== undefined && UNSENT_NETWORK_CODES.has(error.code);
+}
+
+interface RetryOptions {
+  attempts: number;
+  initialDelayMs: number;
+  maxDelayMs: number;
+}
+
+/**
+ * Run task, retrying failures accepted by shouldRetry with exponential backoff and full jitter
+ */
+export async function withRetry<T>(
+  task: () => Promise<T>,
+  options: RetryOptions,
+  shouldRetry: (error: unknown) => boolean = isRetryableError
+): Promise<T> {
+  for (let attempt = 1; ; attempt++) {
+    try {
+      return await task();
+    } catch (error) {
+      if (attempt >= options.attempts || !shouldRetry(error)) {
+        throw error;
+      }
+      const ceiling = Math.min(options.maxDelayMs, options.initialDelayMs * 2 ** (attempt - 1));
+      await new Promise(resolve => setTimeout(resolve, Math.random() * ceiling));
+    }
+  }
+}
+
+/**
+ * Thrown while the circuit breaker is open, so callers can answer 503 and ask clients to back off
+ */
+export class ServiceUnavailableError extends Error {
+  constructor(message = 'AI service is temporarily unavailable, please retry shortly') {
+    super(message);
+    this.name = 'ServiceUnavailableError';
+  }
+}
+
+/**
+ * Fails fast for resetTimeoutMs after maxFailures consecutive failures (a 429/5xx,
+ * or no response at all, timeouts included), then lets a single trial call through to test whether the upstream recovered.
+ */
+export class CircuitBreaker {
+  private failures = 0;
+  private openedAt: number | null = null;
+  private trialInFlight = false;
+
+  constructor(private maxFailures: number, private resetTimeoutMs: number) {}
+
+  async call<T>(task: () => Promise<T>): Promise<T> {
+    let isTrial = false;
+    if (this.openedAt !== null) {
+      if (Date.now() - this.openedAt < this.resetTimeoutMs || this.trialInFlight) {
+        throw new ServiceUnavailableError();
+      }
+      isTrial = true;
+      this.trialInFlight = true;
+    }
+
+    try {
+      const result = await task();
+      this.failures = 0;
+      this.openedAt = null;
+      return result;
+    } catch (error) {
+      // Only a real answer (a non-retryable status) proves the upstream is healthy;
+      // timeouts and other errors without a response count as failures even
+      // though the retry path leaves them alone
+      const answered = axios.isAxiosError(error) && error.response !== undefined && !isRetryableError(error);
+      if (answered) {
+        this.failures = 0;
+        this.openedAt = null;
+      } else {
+        this.failures++;
+        if (isTrial || this.failures >= this.maxFailures) {
+          this.openedAt = Date.now();
+        }
+      }
+      throw error;
+    } finally {
+      if (isTrial) {
+        this.trialInFlight = false;
+      }
+    }
+  }
+}
@@ -0,0 +1,37 @@
+/**
+ * Limits how many async operations run at once; callers beyond the limit
+ * wait in FIFO order for a slot to free up.
+ */
+export class Semaphore {
+  private active = 0;
+  private waiting: Array<() => void> = [];
+
+  constructor(private limit: number) {}
+
+  async run<T>(task: () => Promise<T>): Promise<T> {
+    await this.acquire();
+    try {
+      return await task();
+    } finally {
+      this.release();
+    }
+  }
+
+  private acquire(): Promise<void> {
+    if (this.active < this.limit) {
+      this.active++;
+      return Promise.resolve();
+    }
+    return new Promise(resolve => this.waiting.push(resolve));
+  }
+
+  private release(): void {
+    const next = this.waiting.shift();
+    if (next) {
+      // Hand the slot straight to the next waiter
+      next();
+    } else {
+      this.active--;
+    }
+  }
+}
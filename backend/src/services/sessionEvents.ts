@@ -0,0 +1,142 @@
+import { Readable } from 'stream';
+
+// Subset of the opencode server events used to follow a prompt as it streams
+export interface OpencodeEvent {
+  type: string;
+  properties?: {
+    sessionID?: string;
+    info?: { id: string; sessionID: string; role: string };
+    part?: { id: string; sessionID: string; messageID: string; type: string; text?: string };
+    delta?: string;
+  };
+}
+
+type EventListener = (event: OpencodeEvent) => void;
+
+/**
+ * A single subscription to opencode's global event bus, shared by every caller.
+ * Each event is parsed once and handed only to the listeners of its session.
+ * The stream is opened by the first subscriber and closed when the last one leaves.
+ */
+export class SessionEventStream {
+  private listeners = new Map<string, Set<EventListener>>();
+  private stream: Promise<Readable> | null = null;
+
+  constructor(private open: () => Promise<Readable>) {}
+
+  /**
+   * Pass events for sessionId to listener until the returned function is called.
+   * Resolves once the stream is connected, so nothing emitted after that is missed.
+   */
+  async subscribe(sessionId: string, listener: EventListener): Promise<() => void> {
+    let sessionListeners = this.listeners.get(sessionId);
+    if (!sessionListeners) {
+      sessionListeners = new Set();
+      this.listeners.set(sessionId, sessionListeners);
+    }
+    sessionListeners.add(listener);
+
+    const unsubscribe = () => {
+      const current = this.listeners.get(sessionId);
+      if (current?.delete(listener) && current.size === 0) {
+        this.listeners.delete(sessionId);
+        if (this.listeners.size === 0) {
+          this.disconnect();
+        }
+      }
+    };
+
+    try {
+      await this.connect();
+    } catch (error) {
+      unsubscribe();
+      throw error;
+    }
+    return unsubscribe;
+  }
+
+  /**
+   * Drop all listeners and close the stream
+   */
+  close(): void {
+    this.listeners.clear();
+    this.disconnect();
+  }
+
+  private connect(): Promise<Readable> {
+    if (!this.stream) {
+      const opening = this.open().then(stream => {
+        this.attach(stream, opening);
+        return stream;
+      });
+      opening.catch(() => {
+        if (this.stream === opening) {
+          this.stream = null;
+        }
+      });
+      this.stream = opening;
+    }
+    return this.stream;
+  }
+
+  private disconnect(): void {
+    const current = this.stream;
+    this.stream = null;
+    current?.then(stream => stream.destroy(), () => undefined);
+  }
+
+  private attach(stream: Readable, opening: Promise<Readable>): void {
+    // Server-sent events are separated by a blank line
+    let buffer = '';
+    stream.setEncoding('utf8');
+    stream.on('data', (chunk: string) => {
+      buffer += chunk;
+      let boundary = buffer.indexOf('\n\n');
+      while (boundary !== -1) {
+        const data = buffer.slice(0, boundary)
+          .split('\n')
+          .filter(line => line.startsWith('data:'))
+          .map(line => line.slice(5).trim())
+          .join('\n');
+        buffer = buffer.slice(boundary + 2);
+        boundary = buffer.indexOf('\n\n');
+        if (data) {
+          this.dispatch(data);
+        }
+      }
+    });
+
+    // Subscribers still get the full text from their prompt responses, so a broken
+    // stream only loses deltas; the next subscriber opens a fresh one
+    const reset = () => {
+      if (this.stream === opening) {
+        this.stream = null;
+      }
+    };
+    stream.on('error', reset);
+    stream.on('close', reset);
+  }
+
+  private dispatch(data: string): void {
+    let event: OpencodeEvent;
+    try {
+      event = JSON.parse(data) as OpencodeEvent;
+    } catch {
+      // Ignore malformed events
+      return;
+    }
+    const { sessionID, info, part } = event.properties || {};
+    const sessionId = info?.sessionID ?? part?.sessionID ?? sessionID;
+    const sessionListeners = sessionId ? this.listeners.get(sessionId) : undefined;
+    if (sessionListeners) {
+      for (const listener of sessionListeners) {
+        try {
+          listener(event);
+        } catch (error) {
+          // A failing listener must not take down delivery to the others
+          console.error('Session event listener failed:', error);
+        }
+      }
+    }
+  }
+}
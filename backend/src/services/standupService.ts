@@ -1,7 +1,22 @@
 import { db } from '../db';
-import { opencodeService } from './opencodeService';
+import { opencodeService, needsSmartModel } from './opencodeService';
 import { WorkLog, Ticket, Task, Standup } from '../types';
 
+/**
+ * Append one formatted line per item to text, without building an intermediate array
+ */
+export function appendLines<T>(text: string, items: T[], format: (item: T, index: number) => string): string {
+  for (let i = 0; i < items.length; i++) {
+    const line = format(items[i], i);
+    text = text ? `${text}\n${line}` : line;
+  }
+  return text;
+}
+
+const formatWorkLog = (log: WorkLog) => `- ${log.description} (${log.duration_minutes}m)`;
+const formatTicket = (t: Ticket) => `- [Jira] ${t.id}: ${t.summary} (${t.status})`;
+const formatTask = (t: Task) => `- [Task] ${t.title} (${t.status})`;
+
 export class StandupService {
   async generateStandup(date: string): Promise<Standup> {
     // 1. Get previous day's work logs
@@ -16,14 +31,10 @@ export class StandupService {
     const activeTasks = db.prepare("SELECT * FROM tasks WHERE status NOT IN ('done')").all() as Task[];
 
     // 3. Construct prompt
-    const yesterdaySummary = workLogs.length > 0 
-      ? workLogs.map(log => `- ${log.description} (${log.duration_minutes}m)`).join('\n')
-      : 'No work logs recorded.';
+    const yesterdaySummary = appendLines('', workLogs, formatWorkLog) || 'No work logs recorded.';
 
-    const todaySummary = [
-      ...activeTickets.map(t => `- [Jira] ${t.id}: ${t.summary} (${t.status})`),
-      ...activeTasks.map(t => `- [Task] ${t.title} (${t.status})`)
-    ].join('\n') || 'No active tasks or tickets.';
+    const todaySummary = appendLines(appendLines('', activeTickets, formatTicket), activeTasks, formatTask)
+      || 'No active tasks or tickets.';
 
     const prompt = `Yesterday I worked on:
 ${yesterdaySummary}
@@ -34,7 +45,7 @@ ${todaySummary}
 Please generate a concise standup update for me. Format it with "Yesterday", "Today", and "Blockers" sections.`;
 
     // 4. Call OpenCode service
-    const chatResult = await opencodeService.chat(prompt, 'planner', true);
+    const chatResult = await opencodeService.chat(prompt, 'planner', needsSmartModel(prompt));
     const content = chatResult.response;
     // 5. Save to DB
     const stmt = db.prepare(`
@@ -45,3 +45,28 @@ export interface Standup {
   content: string;
   created_at: string;
 }
+
+export interface ChatResponse {
+  response: string;
+  model: string;
+  agentType: string;
+}
+
+export interface ParsedTicket {
+  key: string;
+  summary: string;
+  status: string;
+  priority: string;
+  description: string;
+  assignee?: string;
+  story_points?: number;
+  labels: string[];
+  components: string[];
+  raw_analysis: string;
+}
+
+export interface TaskAnalysis {
+  title: string;
+  priority: string;
+  description: string;
+}